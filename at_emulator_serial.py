@@ -1,11 +1,21 @@
+import argparse
+import os
+import re
 import serial
 import threading
-import time
 import logging
+from types import MappingProxyType
 from typing import Optional, Tuple
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def decode_serial(data: bytes) -> str:
+  """Decode serial bytes, taking the cheap ASCII path for plain AT traffic."""
+  if data.isascii():
+      return data.decode('ascii')
+  return data.decode('utf-8', errors='ignore')
 
 class ATCommandError(Exception):
   """Custom exception for AT command errors."""
@@ -14,6 +24,56 @@ class ATCommandError(Exception):
 class ATEmulator:
   """AT Command Emulator class."""
 
+  SMS_STATUS_STO_SENT = 3  # <stat> value for a stored, sent message (3GPP TS 27.005)
+  READ_CHUNK_SIZE = 4096  # Upper bound on bytes taken from the port per read
+  _CRLF = b'\r\n'
+  # Base command (up to the first '=' or '?') and a '?' appearing anywhere after it
+  _CMD_RE = re.compile(r'([^=?]*)[^?]*(\??)')
+  # Set form taking a single 0/1 argument, e.g. AT+CMGF=1
+  _FLAG_SET_RE = re.compile(r'[^=]*=([01])')
+
+  # Base command -> name of the handler method, resolved per instance at dispatch
+  COMMAND_HANDLERS = MappingProxyType({
+      'AT': 'handle_at',
+      'ATE0': 'handle_ate0',
+      'ATE1': 'handle_ate1',
+      'ATI': 'handle_ati',
+      'AT+GMI': 'handle_gmi',
+      'AT+GMM': 'handle_gmm',
+      'AT+GMR': 'handle_gmr',
+      'AT+CGMI': 'handle_gmi',
+      'AT+CGMM': 'handle_gmm',
+      'AT+CGMR': 'handle_gmr',
+      'AT+CSQ': 'handle_csq',
+      'AT+CREG?': 'handle_creg',
+      'AT+COPS?': 'handle_cops',  # Ensure this is correctly registered
+      'AT+CMGF': 'handle_cmgf',
+      'AT+CMGS': 'handle_cmgs',
+      'AT+CMGR': 'handle_cmgr',
+      'AT+CMGL': 'handle_cmgl',
+      'AT+CMGD': 'handle_cmgd',
+      'AT+CUSD': 'handle_cusd',
+      'AT+CGATT': 'handle_cgatt',
+      'AT+CIPSTATUS': 'handle_cipstatus',
+      'AT+CIPSTART': 'handle_cipstart',
+      'AT+CIPCLOSE': 'handle_cipclose',
+  })
+
+  # Initial simulated modem state; each instance works on its own copy
+  DEFAULT_STATE = MappingProxyType({
+      'manufacturer': 'Generic',
+      'model': 'Modem 1.0',
+      'revision': '1.0.0',
+      'imei': '123456789012345',
+      'imsi': '310150123456789',
+      'operator': 'Mobilis',
+      'signal_strength': 15,
+      'registration_status': 1,
+      'gprs_attached': 0,
+      'ip_status': 'IP INITIAL',
+      # Add more simulated states here...
+  })
+
   def __init__(self, port: str, baudrate: int = 115200):
       """
       Initialize the emulator.
@@ -23,96 +83,107 @@ class ATEmulator:
       self.port = port
       self.baudrate = baudrate
       self.serial_port = None
+      self.reader_thread = None
       self.running = False
+      self.stopped = threading.Event()  # Set once the emulator is no longer serving
       self.echo = True
       self.verbose = True
       self.quiet = False
       self.sms_mode = 1  # 0: PDU mode, 1: Text mode
-      self.command_handlers = {
-          'AT': self.handle_at,
-          'ATE0': self.handle_ate0,
-          'ATE1': self.handle_ate1,
-          'ATI': self.handle_ati,
-          'AT+GMI': self.handle_gmi,
-          'AT+GMM': self.handle_gmm,
-          'AT+GMR': self.handle_gmr,
-          'AT+CGMI': self.handle_gmi,
-          'AT+CGMM': self.handle_gmm,
-          'AT+CGMR': self.handle_gmr,
-          'AT+CSQ': self.handle_csq,
-          'AT+CREG?': self.handle_creg,
-          'AT+COPS?': self.handle_cops,  # Ensure this is correctly registered
-          'AT+CMGF': self.handle_cmgf,
-          'AT+CMGS': self.handle_cmgs,
-          'AT+CMGR': self.handle_cmgr,
-          'AT+CMGL': self.handle_cmgl,
-          'AT+CMGD': self.handle_cmgd,
-          'AT+CUSD': self.handle_cusd,
-          'AT+CGATT': self.handle_cgatt,
-          'AT+CIPSTATUS': self.handle_cipstatus,
-          'AT+CIPSTART': self.handle_cipstart,
-          'AT+CIPCLOSE': self.handle_cipclose,
-      }
-      self.simulated_state = {
-          'manufacturer': 'Generic',
-          'model': 'Modem 1.0',
-          'revision': '1.0.0',
-          'imei': '123456789012345',
-          'imsi': '310150123456789',
-          'operator': 'Mobilis',
-          'signal_strength': 15,
-          'registration_status': 1,
-          'sms_storage': [],
-          'gprs_attached': 0,
-          'ip_status': 'IP INITIAL',
-          # Add more simulated states here...
+      self._output = bytearray()  # Framed responses waiting for flush_responses()
+      # Stored SMS as parallel columns: one status byte and one body per message
+      self._sms_status = bytearray()
+      self._sms_bodies = []
+      self._next_sms_ref = 1
+      self.simulated_state = dict(self.DEFAULT_STATE)
+      self._cached_responses = {}
+      self.refresh_cached_responses()
+
+  def refresh_cached_responses(self):
+      """
+      Rebuild the pre-encoded responses derived from the simulated state.
+      Call this after changing simulated_state so handlers see the new values.
+      """
+      state = self.simulated_state
+      self._cached_responses = {
+          'ati': f"{state['manufacturer']} {state['model']}".encode('utf-8'),
+          'gmi': state['manufacturer'].encode('utf-8'),
+          'gmm': state['model'].encode('utf-8'),
+          'gmr': state['revision'].encode('utf-8'),
+          'csq': f"+CSQ: {state['signal_strength']},99".encode('utf-8'),
+          'creg': f"+CREG: 0,{state['registration_status']}".encode('utf-8'),
+          'cops': f'+COPS: 0,0,"{state["operator"]}",6'.encode('utf-8'),
+          'cgatt': f"+CGATT: {state['gprs_attached']}".encode('utf-8'),
+          'cipstatus': f"STATE: {state['ip_status']}".encode('utf-8'),
       }
 
   def start(self):
       """Start the emulator and open the serial port."""
       try:
-          self.serial_port = serial.Serial(self.port, self.baudrate, timeout=1)
+          # No timeout: reads block until data arrives, stop() wakes them via cancel_read()
+          self.serial_port = serial.Serial(self.port, self.baudrate, timeout=None)
+          self.stopped.clear()
           self.running = True
-          logging.info(f"Serial port {self.port} opened at baud rate {self.baudrate}.")
+          logger.info("Serial port %s opened at baud rate %s.", self.port, self.baudrate)
           self.listen()
       except serial.SerialException as e:
-          logging.error(f"Error opening serial port: {e}")
+          logger.error("Error opening serial port: %s", e)
+          self.stopped.set()
 
   def stop(self):
       """Stop the emulator and close the serial port."""
       self.running = False
+      self.stopped.set()
       if self.serial_port and self.serial_port.is_open:
+          # Wake the reader thread out of its blocking read and let it exit
+          # before the port goes away underneath it
+          self.serial_port.cancel_read()
+          if self.reader_thread and self.reader_thread is not threading.current_thread():
+              self.reader_thread.join(timeout=1)
           self.serial_port.close()
-          logging.info("Serial port closed.")
+          logger.info("Serial port closed.")
 
   def listen(self):
       """Listen for incoming commands and process them."""
-      thread = threading.Thread(target=self.read_loop, daemon=True)
-      thread.start()
+      self.reader_thread = threading.Thread(target=self.read_loop, daemon=True)
+      self.reader_thread.start()
 
   def read_loop(self):
       """Read data from the serial port in a loop."""
-      buffer = ''
-      while self.running:
-          if self.serial_port.in_waiting:
-              data = self.serial_port.read(self.serial_port.in_waiting).decode('utf-8', errors='ignore')
+      buffer = bytearray()
+      try:
+          while self.running:
+              # Block until data arrives and take everything already buffered in
+              # the same call. An empty result means stop() cancelled the read.
+              data = self.serial_port.read(min(self.serial_port.in_waiting, self.READ_CHUNK_SIZE) or 1)
+              if not data:
+                  continue
               buffer += data
-              if '\r' in buffer or '\n' in buffer:
-                  commands = buffer.strip().split('\r')
-                  for cmd in commands:
-                      if cmd:
-                          self.process_command(cmd.strip())
-                  buffer = ''
-          time.sleep(0.1)
+              # Decode only complete lines; bytes after the last terminator are
+              # the start of a command still being received and stay buffered
+              end = max(buffer.rfind(b'\r'), buffer.rfind(b'\n'))
+              if end != -1:
+                  lines = buffer[:end].split(b'\r')
+                  del buffer[:end + 1]
+                  # Strip each line once, while still bytes, and skip blank ones
+                  for line in lines:
+                      line = line.strip()
+                      if line:
+                          self.process_command(decode_serial(line))
+      finally:
+          self.stopped.set()
 
   def process_command(self, command: str):
       """Process a single AT command."""
-      logging.info(f"Received command: {command}")
+      # Per-command logging is DEBUG and lazily formatted to keep it off the hot path
+      logger.debug("Received command: %s", command)
       if self.echo:
           self.send_response(command)
-      # Correctly handle commands with '?' by splitting on '?' first
-      base_command = command.split('=')[0].split('?')[0] + ('?' if '?' in command else '')
-      handler = self.command_handlers.get(base_command, self.handle_unknown)
+      # Correctly handle commands with '?' by keeping it on the base command.
+      # Only the base is upper-cased; arguments keep their case.
+      match = self._CMD_RE.match(command)
+      base_command = match.group(1).upper() + match.group(2)
+      handler = getattr(self, self.COMMAND_HANDLERS.get(base_command, 'handle_unknown'))
       try:
           response = handler(command)
           if response is not None:
@@ -122,16 +193,27 @@ class ATEmulator:
       except ATCommandError as e:
           self.send_response(f"ERROR: {e}")
       except Exception as e:
-          logging.error(f"Unexpected error: {e}")
+          logger.error("Unexpected error: %s", e)
           self.send_response('ERROR')
-
-  def send_response(self, response: str):
-      """Send a response back over the serial port."""
+      finally:
+          # Echo, response and final result code go out in a single write
+          self.flush_responses()
+
+  def send_response(self, response):
+      """Queue a response (str, or already-encoded bytes) to be sent by flush_responses()."""
+      if isinstance(response, str):
+          response = response.encode('utf-8')
+      # Frame in place in the output buffer; pre-encoded responses skip encoding
       if self.verbose:
-          response = f"\r\n{response}\r\n"
-      else:
-          response = f"{response}\r\n"
-      self.serial_port.write(response.encode('utf-8'))
+          self._output += self._CRLF
+      self._output += response
+      self._output += self._CRLF
+
+  def flush_responses(self):
+      """Write all queued responses to the serial port in one call."""
+      if self._output:
+          self.serial_port.write(bytes(self._output))
+          self._output.clear()
 
   # Command handlers
 
@@ -149,38 +231,38 @@ class ATEmulator:
 
   def handle_ati(self, command: str):
       """Display device information."""
-      return f"{self.simulated_state['manufacturer']} {self.simulated_state['model']}"
+      return self._cached_responses['ati']
 
   def handle_gmi(self, command: str):
       """Display manufacturer name."""
-      return self.simulated_state['manufacturer']
+      return self._cached_responses['gmi']
 
   def handle_gmm(self, command: str):
       """Display device model."""
-      return self.simulated_state['model']
+      return self._cached_responses['gmm']
 
   def handle_gmr(self, command: str):
       """Display firmware revision."""
-      return self.simulated_state['revision']
+      return self._cached_responses['gmr']
 
   def handle_csq(self, command: str):
       """Display signal strength."""
-      return f"+CSQ: {self.simulated_state['signal_strength']},99"
+      return self._cached_responses['csq']
 
   def handle_creg(self, command: str):
       """Display network registration status."""
-      return f"+CREG: 0,{self.simulated_state['registration_status']}"
+      return self._cached_responses['creg']
 
   def handle_cops(self, command: str):
       """Display current operator."""
-      return f'+COPS: 0,0,"{self.simulated_state["operator"]}",6'
+      return self._cached_responses['cops']
 
   def handle_cmgf(self, command: str):
       """Set or display SMS message format."""
       if '=' in command:
-          mode = command.split('=')[1]
-          if mode in ['0', '1']:
-              self.sms_mode = int(mode)
+          match = self._FLAG_SET_RE.fullmatch(command)
+          if match:
+              self.sms_mode = int(match.group(1))
           else:
               raise ATCommandError("Invalid mode")
       else:
@@ -191,9 +273,13 @@ class ATEmulator:
       if self.sms_mode == 1:
           # Text mode
           self.send_response("> ")  # Prompt for input
+          self.flush_responses()  # The prompt must reach the host before we wait
           message = self.read_sms_message()
-          self.simulated_state['sms_storage'].append({'status': 'SENT', 'message': message})
-          return '+CMGS: 1'  # Return message reference
+          self._sms_status.append(self.SMS_STATUS_STO_SENT)
+          self._sms_bodies.append(message)
+          reference = self._next_sms_ref
+          self._next_sms_ref += 1
+          return f'+CMGS: {reference}'  # Return message reference
       else:
           # PDU mode
           raise ATCommandError("PDU mode not supported in this emulator")
@@ -221,26 +307,29 @@ class ATEmulator:
   def handle_cgatt(self, command: str):
       """Attach or detach from GPRS service."""
       if '=' in command:
-          state = command.split('=')[1]
-          if state in ['0', '1']:
-              self.simulated_state['gprs_attached'] = int(state)
+          match = self._FLAG_SET_RE.fullmatch(command)
+          if match:
+              self.simulated_state['gprs_attached'] = int(match.group(1))
+              self.refresh_cached_responses()
           else:
               raise ATCommandError("Invalid state")
       else:
-          return f"+CGATT: {self.simulated_state['gprs_attached']}"
+          return self._cached_responses['cgatt']
 
   def handle_cipstatus(self, command: str):
       """Display IP status."""
-      return f"STATE: {self.simulated_state['ip_status']}"
+      return self._cached_responses['cipstatus']
 
   def handle_cipstart(self, command: str):
       """Start TCP/IP connection."""
       self.simulated_state['ip_status'] = 'CONNECTED'
+      self.refresh_cached_responses()
       return 'OK'
 
   def handle_cipclose(self, command: str):
       """Close TCP/IP connection."""
       self.simulated_state['ip_status'] = 'IP INITIAL'
+      self.refresh_cached_responses()
       return 'CLOSE OK'
 
   def handle_unknown(self, command: str):
@@ -249,26 +338,35 @@ class ATEmulator:
 
   def read_sms_message(self) -> str:
       """Read SMS message input from the user."""
-      message = ''
-      while True:
-          data = self.serial_port.read(self.serial_port.in_waiting or 1).decode('utf-8', errors='ignore')
-          if data:
-              message += data
-              if '\x1a' in message:  # Ctrl+Z to end input
-                  message = message.replace('\x1a', '')
-                  break
-      return message.strip()
-
-def main():
-  emulator = ATEmulator(port='COM1', baudrate=9600)
+      message = bytearray()
+      while self.running:
+          data = self.serial_port.read(min(self.serial_port.in_waiting, self.READ_CHUNK_SIZE) or 1)
+          end = data.find(b'\x1a')  # Ctrl+Z to end input
+          if end != -1:
+              message += data[:end]
+              break
+          message += data
+      return decode_serial(message).strip()
+
+def main(port: str = 'COM1', baudrate: int = 115200):
+  emulator = ATEmulator(port=port, baudrate=baudrate)
   try:
       emulator.start()
-      while True:
-          time.sleep(1)
+      # Wait for the reader to exit. On Windows an untimed Event.wait() can't
+      # be interrupted by Ctrl+C, so only there wake up once a second
+      if os.name == 'nt':
+          while not emulator.stopped.wait(1):
+              pass
+      else:
+          emulator.stopped.wait()
   except KeyboardInterrupt:
-      logging.info("Stopping emulator.")
+      logger.info("Stopping emulator.")
   finally:
       emulator.stop()
 
 if __name__ == "__main__":
-  main()
\ No newline at end of file
+  parser = argparse.ArgumentParser(description="AT Command Emulator")
+  parser.add_argument('--port', default='COM1', help="Serial port to listen on (default: COM1)")
+  parser.add_argument('--baudrate', type=int, default=115200, help="Baud rate (default: 115200)")
+  args = parser.parse_args()
+  main(args.port, args.baudrate)
\ No newline at end of file
@@ -5,6 +5,8 @@ from binascii import unhexlify
 
 port = 'COM6'  
 baudrate = 9600
+# USSD answers come from the network after the OK and can take a few seconds
+ussd_timeout = 10
 
 commands = [
 
@@ -23,13 +25,19 @@ commands = [
 
 ]
 
-with serial.Serial(port, baudrate, timeout=1) as ser:
+# The timeout bounds each read_until, e.g. when the modem answers ERROR instead of OK
+with serial.Serial(port, baudrate, timeout=2) as ser:
   time.sleep(2)  
 
   for command in commands:
       ser.write((command + '\r\n').encode())  
-      time.sleep(3)  
-      response = ser.read(ser.in_waiting or 1).decode() 
+      response = ser.read_until(b'OK\r\n').decode() 
+      if command.upper().startswith('AT+CUSD=') and 'OK' in response and '+CUSD:' not in response:
+          # Most modems send the USSD reply after the OK, as an unsolicited +CUSD: line
+          ser.timeout = ussd_timeout
+          response += ser.read_until(b'+CUSD:').decode()
+          response += ser.read_until(b'\r\n').decode()
+          ser.timeout = 2
       print(f"Response for '{command}': {response}") 
 
   ser.close()      
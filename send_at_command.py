@@ -1,24 +1,92 @@
+import atexit
+import errno
 import serial
 import serial.tools.list_ports
 import logging
+import logging.handlers
+import queue
+import random
 import sys
-from typing import Tuple, List, Optional
+import os
+import re
+import selectors
+import functools
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Pattern, Tuple, List, Optional
 from datetime import datetime
 import time
 
-# Setup logging with more detailed error information
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-    handlers=[
-        logging.FileHandler(f'serial_errors_{datetime.now().strftime("%Y%m%d")}.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Setup logging with more detailed error information. Records are queued and
+# written to the log file and stdout by a background listener thread, so the
+# serial I/O path never waits on disk or console writes.
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s')
+_log_handlers = [
+    logging.FileHandler(f'serial_errors_{datetime.now().strftime("%Y%m%d")}.log'),
+    logging.StreamHandler(sys.stdout)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+# main() probes SIM ports on threads named with this prefix, possibly while the
+# port prompt is on screen; their records only go to the log file
+_PROBE_THREAD_PREFIX = 'sim-probe'
+_log_handlers[1].addFilter(lambda record: not record.threadName.startswith(_PROBE_THREAD_PREFIX))
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.getLogger().setLevel(logging.DEBUG)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
 
 # Set isDev to 1 to include "com0com" ports in the SIM ports list
 isDev = 1
 
+# Port descriptions that identify a SIM/modem port, compiled once for all ports
+_SIM_PORT_RE = re.compile(r'SIM|Modem' + (r'|com0com|Control' if isDev else ''))
+
+# How long, in seconds, a serial port enumeration is reused
+_COMPORTS_TTL = 0.5
+_comports_cache: Tuple[float, tuple] = (float('-inf'), ())
+
+# Baud rate used unless the caller asks for another one; most modems accept
+# 115200 and autobaud to it from the first AT
+DEFAULT_BAUDRATE = 115200
+
+# Open serial ports reused across commands, keyed by port name
+_PORT_CACHE: Dict[str, serial.Serial] = {}
+
+# Operator names already read with AT+COPS?, keyed by port name, as
+# (time.monotonic() timestamp, name), and how long in seconds they are reused
+_OPERATOR_CACHE: Dict[str, Tuple[float, str]] = {}
+_OPERATOR_CACHE_TTL = 60.0
+
+# Concurrent SIM-operator probing: thread pool size and per-port time limit in seconds
+_MAX_PROBE_WORKERS = 8
+_PROBE_TIMEOUT = 2.0
+# Extra time main() waits for the probes beyond their own limit, e.g. for opening the port
+_PROBE_GRACE = 0.5
+
+# Final result code closing a modem reply (OK, ERROR with optional text as sent
+# by the emulator, +CME/+CMS ERROR: <err>, or a call result), and the largest
+# replies we accept
+_FINAL_RESULT_RE = re.compile(rb'\r\n(?:OK|ERROR(?:: [^\r\n]*)?|\+CM[ES] ERROR: [^\r\n]*'
+                              rb'|NO CARRIER|BUSY|NO ANSWER|NO DIALTONE)\r\n\Z')
+_MAX_RESPONSE_SIZE = 4096
+_MAX_MESSAGE_RESPONSE_SIZE = 8192
+# Prompt sent by the modem (e.g. after AT+CMGS) when it is ready for the message
+# body; some devices terminate it with CRLF
+_MESSAGE_PROMPT_RE = re.compile(rb'> (?:\r\n)?\Z')
+# The modem may refuse the message with a result code instead of the prompt
+_PROMPT_OR_RESULT_RE = re.compile(_MESSAGE_PROMPT_RE.pattern + b'|' + _FINAL_RESULT_RE.pattern)
+# Only this many trailing bytes are searched for the end of a reply; longer
+# than any final result line
+_REPLY_TAIL_SIZE = 128
+# Upper bound in seconds on waiting for a complete reply
+_RESPONSE_TIMEOUT = 1.0
+
+# Operator name in an AT+COPS? reply, e.g. +COPS: 0,0,"Mobilis",6
+_COPS_RE = re.compile(rb'\+COPS:\s*\d+,\d+,"([^"]+)"')
+
 class SerialPortError(Exception):
     """Custom exception class for serial port related errors with detailed messages"""
     def __init__(self, message: str, error_code: Optional[int] = None):
@@ -40,6 +108,16 @@ def format_error_message(error: Exception, context: str) -> str:
     """
     return f"Error in {context}: {str(error)}\nType: {type(error).__name__}"
 
+def _comports() -> tuple:
+    """Enumerate the system's serial ports, reusing a result younger than _COMPORTS_TTL."""
+    global _comports_cache
+    now = time.monotonic()
+    timestamp, ports = _comports_cache
+    if now - timestamp > _COMPORTS_TTL:
+        ports = tuple(serial.tools.list_ports.comports())
+        _comports_cache = (now, ports)
+    return ports
+
 def list_serial_ports() -> Tuple[List[str], List[str]]:
     """
     List all available serial ports and identify SIM USB ports if possible.
@@ -51,37 +129,22 @@ def list_serial_ports() -> Tuple[List[str], List[str]]:
         SerialPortError: If there's an error listing the ports
     """
     try:
-        ports = serial.tools.list_ports.comports()
+        ports = _comports()
         if not ports:
             error_msg = "No serial ports detected on this system"
             logging.warning(error_msg)
             print(f"Warning: {error_msg}")
             return [], []
 
-        available_ports = []
-        sim_ports = []
-        
-        for port in ports:
-            try:
-                port_info = f"{port.device} - {port.description}"
-                
-                # Check for SIM or Modem in description
-                if "SIM" in port.description or "Modem" in port.description:
-                    port_info += " (SIM port)"
-                    sim_ports.append(port.device)
-                
-                if isDev and ("com0com" in port.description or "Control" in port.description):
-                    port_info += " (SIM port)"
-                    sim_ports.append(port.device)
-                
-                available_ports.append(port_info)
-                logging.debug(f"Port detected: {port_info}")
-                
-            except Exception as e:
-                error_msg = format_error_message(e, f"processing port {port.device}")
-                logging.error(error_msg)
-                print(f"Error: {error_msg}")
-                
+        # Classify every port in one pass (SIM, Modem, or com0com in dev mode),
+        # then build both lists from the result
+        entries = [(bool(_SIM_PORT_RE.search(port.description)), port.device, port.description)
+                   for port in ports]
+        available_ports = [f"{device} - {description}{' (SIM port)' if is_sim else ''}"
+                           for is_sim, device, description in entries]
+        # A device can be enumerated more than once; keep the first occurrence
+        sim_ports = list(dict.fromkeys(device for is_sim, device, _ in entries if is_sim))
+        logging.debug("Detected %d ports (%d SIM)", len(entries), len(sim_ports))
         return available_ports, sim_ports
         
     except Exception as e:
@@ -89,15 +152,25 @@ def list_serial_ports() -> Tuple[List[str], List[str]]:
         logging.error(error_msg)
         raise SerialPortError(error_msg)
     
-def open_serial_port(port: str, baudrate: int = 9600, retries: int = 3, delay: float = 2.0) -> Optional[serial.Serial]:
+def _is_missing_port_error(error: serial.SerialException) -> bool:
+    """Tell whether opening failed because the port does not exist (no point retrying)."""
+    # POSIX sets errno; Windows only reports FileNotFoundError in the message
+    return getattr(error, 'errno', None) == errno.ENOENT or 'FileNotFoundError' in str(error)
+
+def open_serial_port(port: str, baudrate: int = DEFAULT_BAUDRATE, retries: int = 3,
+                     base_delay: float = 0.05, max_delay: float = 1.0) -> Optional[serial.Serial]:
     """
     Tries to open a serial port with retry capability.
     
+    Transient failures (e.g. port busy) are retried with exponential backoff
+    plus a little jitter; a port that does not exist is not retried.
+    
     Args:
         port (str): Serial port name
         baudrate (int): Baud rate for the port
         retries (int): Number of retries if the port fails to open
-        delay (float): Delay in seconds between retries
+        base_delay (float): Delay in seconds before the first retry, doubled on each retry
+        max_delay (float): Upper bound in seconds for the backoff delay
     
     Returns:
         serial.Serial: Opened serial port object or None if it fails after retries
@@ -105,22 +178,186 @@ def open_serial_port(port: str, baudrate: int = 9600, retries: int = 3, delay: f
     for attempt in range(retries):
         try:
             ser = serial.Serial(port, baudrate, timeout=1)
+            if hasattr(ser, 'set_buffer_size'):
+                # Windows only: room for long replies such as AT+CMGL listings
+                ser.set_buffer_size(rx_size=16384)
+            try:
+                # USB-serial bridges otherwise hold each reply for their ~16 ms latency timer
+                ser.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+                # Not available on this platform or driver (e.g. Windows, virtual ports)
+                logging.debug("Low latency mode not enabled for %s: %s", port, e)
             logging.info(f"Successfully opened port: {port}")
             return ser
         except serial.SerialException as e:
             logging.error(f"Attempt {attempt + 1}: Failed to open port {port}: {e}")
-            time.sleep(delay)
+            if _is_missing_port_error(e):
+                logging.error(f"Port {port} does not exist; not retrying.")
+                return None
+            if attempt < retries - 1:
+                # Nothing left to wait for after the last attempt
+                time.sleep(min(max_delay, base_delay * (2 ** attempt)) + random.uniform(0, 0.02))
     
     logging.error(f"All attempts to open port {port} failed.")
     return None
 
+def get_port(port: str, baudrate: int = DEFAULT_BAUDRATE) -> serial.Serial:
+    """
+    Return an open serial port, reusing the one cached for this port name.
+    
+    The port is opened on first use and stays open for later commands; all
+    cached ports are closed when the program exits.
+    
+    Args:
+        port (str): Serial port name
+        baudrate (int): Baud rate for the port
+        
+    Returns:
+        serial.Serial: Open serial port object
+        
+    Raises:
+        SerialPortError: If the port cannot be opened
+    """
+    ser = _PORT_CACHE.get(port)
+    if ser is None or not ser.is_open:
+        ser = open_serial_port(port, baudrate)
+        if ser is None:
+            raise SerialPortError(f"Failed to open port {port} after multiple attempts")
+        _PORT_CACHE[port] = ser
+    elif ser.baudrate != baudrate:
+        ser.baudrate = baudrate
+    return ser
 
-def get_sim_operator(port: str) -> str:
+def _discard_port(port: str) -> None:
+    """Close and forget a cached port, e.g. after a communication error."""
+    # Whatever answers on this port next may be a different modem
+    _OPERATOR_CACHE.pop(port, None)
+    ser = _PORT_CACHE.pop(port, None)
+    if ser is not None:
+        try:
+            ser.close()
+        except serial.SerialException as e:
+            logging.debug("Error closing port %s: %s", port, e)
+
+@atexit.register
+def _close_all_ports() -> None:
+    """Close every cached port at interpreter exit."""
+    for port in list(_PORT_CACHE):
+        _discard_port(port)
+
+class SerialSession:
+    """
+    Serial connection that is opened once and reused for successive AT commands.
+    
+    The session owns its own handle, separate from the get_port cache: the port
+    is opened lazily on first use and closed when the session is closed or its
+    ``with`` block exits.
+    """
+    def __init__(self, port: str, baudrate: int = DEFAULT_BAUDRATE):
+        self.port = port
+        self.baudrate = baudrate
+        self._serial: Optional[serial.Serial] = None
+
+    @property
+    def serial(self) -> serial.Serial:
+        """
+        Return the open serial port, opening it on first access.
+        
+        Raises:
+            SerialPortError: If the port cannot be opened
+        """
+        if self._serial is None or not self._serial.is_open:
+            self._serial = open_serial_port(self.port, self.baudrate)
+            if self._serial is None:
+                raise SerialPortError(f"Failed to open port {self.port} after multiple attempts")
+        return self._serial
+
+    def close(self) -> None:
+        """Close the underlying serial port if it is open."""
+        if self._serial is not None and self._serial.is_open:
+            self._serial.close()
+            logging.info(f"Closed port: {self.port}")
+        self._serial = None
+
+    def __enter__(self) -> "SerialSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+def _reply_complete(buffer: bytearray, sentinel: Pattern[bytes]) -> bool:
+    """Tell whether the end of a reply read so far matches the sentinel pattern."""
+    return sentinel.search(buffer, max(0, len(buffer) - _REPLY_TAIL_SIZE)) is not None
+
+def _read_until_sentinel(ser: serial.Serial, sentinel: Pattern[bytes],
+                         overall_timeout: float = _RESPONSE_TIMEOUT,
+                         max_size: int = _MAX_RESPONSE_SIZE) -> bytearray:
+    """
+    Read a reply until its end matches a sentinel pattern.
+    
+    Unlike Serial.read_until, this stops on any final result code (OK, ERROR,
+    +CME ERROR: ...), so a failed command doesn't wait out the whole timeout. On
+    POSIX the port descriptor is waited on with a selector and drained in chunks.
+    
+    Args:
+        ser (serial.Serial): Open serial port
+        sentinel (Pattern[bytes]): Pattern, anchored at the end, matching a complete reply
+        overall_timeout (float): Maximum time in seconds to wait for the whole reply
+        max_size (int): Maximum number of bytes to read
+        
+    Returns:
+        bytearray: Data read, possibly incomplete if the timeout or size limit was hit
+        
+    Raises:
+        serial.SerialException: If the device disconnects while reading
+    """
+    buffer = bytearray()
+    deadline = time.monotonic() + overall_timeout
+    if os.name == 'posix':
+        fd = ser.fileno()
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while len(buffer) < max_size and not _reply_complete(buffer, sentinel):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    break
+                try:
+                    chunk = os.read(fd, max_size - len(buffer))
+                except OSError as e:
+                    raise serial.SerialException(f"read failed: {e}")
+                if not chunk:
+                    raise serial.SerialException("device reports readiness to read but returned no data")
+                buffer += chunk
+    else:
+        # No selectable descriptor (Windows): block for the first byte, then
+        # take whatever else is already buffered. The port's own read timeout is
+        # narrowed to the time left so a silent device can't overrun the deadline.
+        port_timeout = ser.timeout
+        try:
+            while len(buffer) < max_size and not _reply_complete(buffer, sentinel):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                ser.timeout = remaining
+                buffer += ser.read(min(ser.in_waiting, max_size - len(buffer)) or 1)
+        finally:
+            ser.timeout = port_timeout
+    return buffer
+
+def get_sim_operator(port: str, baudrate: int = DEFAULT_BAUDRATE,
+                     timeout: float = _RESPONSE_TIMEOUT) -> str:
     """
     Send AT+COPS? command to get the SIM operator name.
     
+    A name read within the last _OPERATOR_CACHE_TTL seconds is returned
+    without querying the modem again.
+    
     Args:
         port (str): Serial port name
+        baudrate (int): Baud rate for the port
+        timeout (float): Time in seconds, counted from the start of this call,
+            after which the reply is no longer waited for; time spent opening
+            the port counts against it, but opening itself is not cut short
         
     Returns:
         str: SIM operator name
@@ -128,32 +365,75 @@ def get_sim_operator(port: str) -> str:
     Raises:
         SerialPortError: If there's an error communicating with the port
     """
+    timestamp, operator_name = _OPERATOR_CACHE.get(port, (float('-inf'), None))
+    if time.monotonic() - timestamp < _OPERATOR_CACHE_TTL:
+        logging.debug("Using cached operator %s for port %s", operator_name, port)
+        return operator_name
+    
+    deadline = time.monotonic() + timeout
     try:
-        with serial.Serial(port, 9600, timeout=1) as ser:
-            ser.write(b'AT+COPS?\r\n')
-            response = ser.read(100).decode(errors='ignore')
-            
-            if "+COPS:" in response:
-                parts = response.split(',')
-                if len(parts) > 2:
-                    operator_name = parts[2].strip().strip('"')
-                    logging.info(f"Successfully found operator: {operator_name} for port {port}")
-                    return operator_name
-            
-            error_msg = f"No operator information available for port {port}"
-            logging.warning(error_msg)
-            return "Unknown Operator"
+        ser = get_port(port, baudrate)
+        ser.reset_input_buffer()
+        ser.write(b'AT+COPS?\r\n')
+        # Match on the raw bytes and decode only the operator name
+        reply = _read_until_sentinel(ser, _FINAL_RESULT_RE, max(0.0, deadline - time.monotonic()))
+        match = _COPS_RE.search(reply)
+        if match:
+            operator_name = match.group(1).decode(errors='ignore')
+            _OPERATOR_CACHE[port] = (time.monotonic(), operator_name)
+            logging.info(f"Successfully found operator: {operator_name} for port {port}")
+            return operator_name
+        
+        error_msg = f"No operator information available for port {port}"
+        logging.warning(error_msg)
+        return "Unknown Operator"
             
     except serial.SerialException as e:
+        _discard_port(port)
         error_msg = format_error_message(e, f"accessing port {port}")
         logging.error(error_msg)
         raise SerialPortError(f"Failed to access port {port}: {str(e)}")
+    except SerialPortError:
+        # Already descriptive, e.g. the port could not be opened
+        raise
     except Exception as e:
         error_msg = format_error_message(e, "getting SIM operator")
         logging.error(error_msg)
         raise SerialPortError(error_msg)
 
-def send_at_command(command: str, port: str, message: Optional[str] = None) -> str:
+def probe_sim_operators(sim_ports: List[str]) -> Dict[str, futures.Future]:
+    """
+    Start querying the operator of several SIM ports concurrently.
+    
+    Each blocking get_sim_operator call runs on a small thread pool (pyserial
+    releases the GIL while waiting), so the total wait is that of the slowest
+    port rather than the sum. Each probe is limited to _PROBE_TIMEOUT from the
+    moment a worker starts it, so ports queued behind others are still probed.
+    The worker threads are named with _PROBE_THREAD_PREFIX, which keeps their
+    log records off the console.
+    
+    Args:
+        sim_ports (List[str]): Serial port names to probe
+        
+    Returns:
+        Dict[str, futures.Future]: Future of the operator name for each port, in order
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, min(_MAX_PROBE_WORKERS, len(sim_ports))),
+                                  thread_name_prefix=_PROBE_THREAD_PREFIX)
+    probes = {port: executor.submit(get_sim_operator, port, timeout=_PROBE_TIMEOUT)
+              for port in sim_ports}
+    # Queued probes still run; callers wait on the futures, not the pool
+    executor.shutdown(wait=False)
+    return probes
+
+@functools.lru_cache(maxsize=128)
+def _encode_command(command: str) -> bytes:
+    """Encode an AT command line once; repeated commands such as AT+CSQ come from the cache."""
+    return f"{command}\r\n".encode()
+
+def send_at_command(command: str, port: str, message: Optional[str] = None,
+                    session: Optional[SerialSession] = None,
+                    baudrate: int = DEFAULT_BAUDRATE) -> str:
     """
     Send an AT command to the specified serial port.
     
@@ -161,6 +441,10 @@ def send_at_command(command: str, port: str, message: Optional[str] = None) -> s
         command (str): AT command to send
         port (str): Serial port
         message (Optional[str]): Message (if required)
+        session (Optional[SerialSession]): Open session to send through instead
+            of the cached port; its port and baud rate take precedence over
+            ``port`` and ``baudrate``
+        baudrate (int): Baud rate for the port
         
     Returns:
         str: Device response
@@ -168,47 +452,130 @@ def send_at_command(command: str, port: str, message: Optional[str] = None) -> s
     Raises:
         SerialPortError: If there's an error sending the command
     """
+    if session is not None:
+        port, baudrate = session.port, session.baudrate
     if not port:
         error_msg = "No port specified for AT command"
         logging.error(error_msg)
         raise SerialPortError(error_msg)
         
     try:
-        ser = open_serial_port(port)
-        if ser is None:
-            raise SerialPortError(f"Failed to open port {port} after multiple attempts")
-        with ser:
-            # Send command
-            ser.write(f"{command}\r\n".encode())
-            logging.debug(f"Successfully sent command: {command}")
-
-            # Read response
-            response = ser.read(100).decode(errors='ignore')
-            if not response:
-                error_msg = "No response received from device"
-                logging.warning(error_msg)
-                print(f"Warning: {error_msg}")
-            else:
-                logging.info(f"Response received: {response}")
-
-            # If there's a message, send it
-            if message:
-                ser.write(f"{message}\x1A".encode())
-                logging.debug(f"Message sent: {message}")
-                additional_response = ser.read(100).decode(errors='ignore')
-                response += additional_response
-            
-            return response
+        ser = session.serial if session is not None else get_port(port, baudrate)
+        ser.reset_input_buffer()  # Drop anything left over from an earlier timed-out reply
+        # Send command
+        ser.write(_encode_command(command))
+        logging.debug("Successfully sent command: %s", command)
+
+        # Read response, returning as soon as the final result code arrives, or
+        # the '> ' prompt when the modem is waiting for a message body
+        sentinel = _PROMPT_OR_RESULT_RE if message else _FINAL_RESULT_RE
+        response = _read_until_sentinel(ser, sentinel)
+        if not response:
+            error_msg = "No response received from device"
+            logging.warning(error_msg)
+            print(f"Warning: {error_msg}")
+
+        # If there's a message, send it, unless the modem already answered with
+        # a result code (e.g. +CMS ERROR) and is still in command mode
+        if message and _reply_complete(response, _FINAL_RESULT_RE):
+            logging.warning("Message not sent: no prompt after %s", command)
+        elif message:
+            ser.write(message.encode() + b'\x1A')
+            logging.debug("Message sent: %s", message)
+            response += _read_until_sentinel(ser, _FINAL_RESULT_RE, max_size=_MAX_MESSAGE_RESPONSE_SIZE)
+
+        # Decode once; modems talk ASCII, so anything else is shown as U+FFFD
+        response = response.decode('ascii', 'replace')
+        if response:
+            logging.info(f"Response received: {response}")
+        return response
         
     except serial.SerialException as e:
+        if session is not None:
+            session.close()
+        else:
+            _discard_port(port)
         error_msg = format_error_message(e, f"communicating with port {port}")
         logging.error(error_msg)
         raise SerialPortError(f"Communication error with port {port}: {str(e)}")
+    except SerialPortError:
+        # Already descriptive, e.g. the port could not be opened
+        raise
     except Exception as e:
         error_msg = format_error_message(e, "sending AT command")
         logging.error(error_msg)
         raise SerialPortError(error_msg)
+
+def send_at_batch(port: str, commands: List[str], baudrate: int = DEFAULT_BAUDRATE) -> List[str]:
+    """
+    Send several AT commands to the specified serial port in one session.
+    
+    The port is opened (or taken from the cache) once, and each command is
+    written as soon as the reply to the previous one is complete.
+    
+    Args:
+        port (str): Serial port
+        commands (List[str]): AT commands to send, in order
+        baudrate (int): Baud rate for the port
+        
+    Returns:
+        List[str]: Device response to each command, in the same order
+        
+    Raises:
+        SerialPortError: If there's an error sending the commands
+    """
+    if not port:
+        error_msg = "No port specified for AT commands"
+        logging.error(error_msg)
+        raise SerialPortError(error_msg)
+        
+    try:
+        ser = get_port(port, baudrate)
+        ser.reset_input_buffer()  # Drop anything left over from an earlier timed-out reply
+        responses = []
+        for command in commands:
+            ser.write(_encode_command(command))
+            logging.debug("Successfully sent command: %s", command)
+            responses.append(_read_until_sentinel(ser, _FINAL_RESULT_RE).decode('ascii', 'replace'))
+        return responses
+        
+    except serial.SerialException as e:
+        _discard_port(port)
+        error_msg = format_error_message(e, f"communicating with port {port}")
+        logging.error(error_msg)
+        raise SerialPortError(f"Communication error with port {port}: {str(e)}")
+    except SerialPortError:
+        # Already descriptive, e.g. the port could not be opened
+        raise
+    except Exception as e:
+        error_msg = format_error_message(e, "sending AT commands")
+        logging.error(error_msg)
+        raise SerialPortError(error_msg)
+    
+def _print_sim_operators(probes: Dict[str, futures.Future]) -> None:
+    """Print the operator (or error) found so far by probe_sim_operators for each SIM port."""
+    lines = ["\nDetected SIM ports:"]
+    sim_ports_with_operators = []
+    pending = False
+    
+    for i, (sim_port, probe) in enumerate(probes.items()):
+        if not probe.done():
+            pending = True
+            lines.append(f"{i + 1}: {sim_port} (SIM port) - (still probing...)")
+        elif probe.exception() is not None:
+            # get_sim_operator has already logged the failure
+            lines.append(f"Error: Error with port {sim_port}: {str(probe.exception())}")
+        else:
+            sim_ports_with_operators.append((sim_port, probe.result()))
+            lines.append(f"{i + 1}: {sim_port} (SIM port) - {probe.result()}")
     
+    if not sim_ports_with_operators and not pending:
+        lines.append("Warning: No accessible SIM ports found.")
+    
+    # One write for the whole block rather than a flushed line per port
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
 def main():
     """Main program function with enhanced error handling"""
     try:
@@ -223,27 +590,21 @@ def main():
             print("Please check your device connections and try again.")
             return
             
-        print("\nAvailable serial ports:")
-        for i, port_info in enumerate(available_ports):
-            print(f"{i + 1}: {port_info}")
-
-        # Handle SIM ports
-        if sim_ports:
-            print("\nDetected SIM ports:")
-            sim_ports_with_operators = []
-            
-            for i, sim_port in enumerate(sim_ports):
-                try:
-                    operator_name = get_sim_operator(sim_port)
-                    sim_ports_with_operators.append((sim_port, operator_name))
-                    print(f"{i + 1}: {sim_port} (SIM port) - {operator_name}")
-                except SerialPortError as e:
-                    error_msg = f"Error with port {sim_port}: {str(e)}"
-                    logging.error(error_msg)
-                    print(f"Error: {error_msg}")
+        # Probe SIM operators in the background so the modem round trips
+        # overlap with the user reading the list and choosing a port
+        probes = probe_sim_operators(sim_ports) if sim_ports else {}
             
-            if not sim_ports_with_operators:
-                print("Warning: No accessible SIM ports found.")
+        # Write the whole list at once rather than a flushed line per port
+        sys.stdout.write("\nAvailable serial ports:\n"
+                         + "".join(f"{i + 1}: {port_info}\n" for i, port_info in enumerate(available_ports)))
+        sys.stdout.flush()
+
+        # Handle SIM ports: show the operators now if every probe is done
+        operators_shown = all(probe.done() for probe in probes.values())
+        if probes and operators_shown:
+            _print_sim_operators(probes)
+        elif probes:
+            print("\nDetected SIM ports: (probing operators...)")
         
         # Allow user to select any available port if no SIM ports detected
         while True:
@@ -263,6 +624,19 @@ def main():
                 logging.error(error_msg)
                 print(f"Error: {error_msg}")
 
+        # Show the operators once the probes have finished. Each probe gives up
+        # _PROBE_TIMEOUT after a worker starts it, so allow that for every round
+        # of queued ports, plus a little more, before listing any as unfinished.
+        if not operators_shown:
+            rounds = -(-len(probes) // _MAX_PROBE_WORKERS)
+            futures.wait(probes.values(), timeout=rounds * _PROBE_TIMEOUT + _PROBE_GRACE)
+            _print_sim_operators(probes)
+
+        # A probe still running on the selected port would share it with the
+        # command below; it returns shortly after its own time limit
+        if selected_port in probes:
+            futures.wait([probes[selected_port]])
+
         # Get AT command and message with validation
         while True:
             command = input("\nEnter AT command (e.g., AT+CMGF=1 for text mode): ").strip()